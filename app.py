@@ -1,19 +1,21 @@
+import io
+import multiprocessing
+import os
+
+# Non-interactive backend chosen before anything can import pyplot
+os.environ.setdefault("MPLBACKEND", "Agg")
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 
-st.set_page_config(page_title="Nuclear Shielding & Build-up Lab", layout="wide")
+from shielding import (MATERIALS, MATERIAL_NAMES, B_SLOPE_STACK, linear_attenuation, BUILDUP_RULES,
+                       stack_coefficients, layered_transmission, OBJECTIVES, optimize_stack, simulate_buildup,
+                       SOURCE_SPECTRA, mean_energy, spectrum_transmission, spectrum_required_thickness,
+                       adaptive_thickness_grid, minmax_downsample, memoize, DISK_CACHE, half_value_layer,
+                       tenth_value_layer, required_thickness, library_from_env, library_coefficients,
+                       MIXTURES, mixture_attenuation)
 
-# --- MATERIALS DATABASE (Data for 1.0 MeV Photons) ---
-# mu: Linear Attenuation (cm^-1) | b_factor_ref: Approximate build-up slope
-# Lead (Pb), Tungsten (W), Iron (Fe), Concrete, Water (H2O)
-MATERIALS = {
-    "Lead (Pb)": {"mu": 0.771, "color": "#7f8c8d", "b_slope": 1.2},
-    "Tungsten (W)": {"mu": 1.250, "color": "#2c3e50", "b_slope": 1.1},
-    "Iron (Fe)": {"mu": 0.443, "color": "#a04000", "b_slope": 1.8},
-    "Concrete": {"mu": 0.151, "color": "#bdc3c7", "b_slope": 2.5},
-    "Water": {"mu": 0.070, "color": "#3498db", "b_slope": 3.2}
-}
+st.set_page_config(page_title="Nuclear Shielding & Build-up Lab", layout="wide")
 
 st.title(" Advanced Radiation Shielding & Build-up Analysis")
 st.markdown("""
@@ -22,51 +24,236 @@ the **Build-up Factor ($B$)**. Without build-up, shielding requirements are ofte
 """)
 
 # --- SIDEBAR ---
+# Only inputs that several sections read live here, so changing them reruns the whole page. Controls that feed a
+# single section live inside that section's fragment, so interacting with them reruns just that fragment.
 st.sidebar.header("Calculation Settings")
-max_thick = st.sidebar.slider("Max Analysis Thickness (cm)", 10, 100, 50)
-energy_mev = st.sidebar.selectbox("Source Energy", ["0.5 MeV", "1.0 MeV", "2.0 MeV"])
-
-# --- PHYSICS LOGIC ---
-def calculate_attenuation(thickness_range, mu, b_slope, use_buildup=True):
-    # Mean free paths (mfp)
-    mfp = mu * thickness_range
-    # Linear Build-up Approximation: B = 1 + (b_slope * mfp)
-    B = 1 + (b_slope * mfp) if use_buildup else 1.0
-    # Transmission (I/I0)
-    transmission = B * np.exp(-mfp)
-    return transmission
+energy_mev = st.sidebar.selectbox("Source Energy", ["0.5 MeV", "1.0 MeV", "2.0 MeV"] + list(SOURCE_SPECTRA))
+# Every source is a set of lines; a monoenergetic choice is a single line of weight 1
+if energy_mev in SOURCE_SPECTRA:
+    source_lines = (tuple(SOURCE_SPECTRA[energy_mev]["energy"]), tuple(SOURCE_SPECTRA[energy_mev]["intensity"]))
+else:
+    source_lines = ((float(energy_mev.split()[0]),), (1.0,))
+source_energy = mean_energy(*source_lines)
+if energy_mev in SOURCE_SPECTRA:
+    st.sidebar.caption(f"Single-energy panels below use the mean line energy, {source_energy:.3f} MeV.")
+MU_STACK = linear_attenuation(source_energy)
+BUILDUP_MODEL_LABELS = {"Linear": "linear", "Geometric Progression (GP)": "gp",
+                        "Taylor (fitted to GP)": "taylor", "Berger (fitted to GP)": "berger"}
+design_limit = st.sidebar.number_input("Design Transmission Limit ($I/I_0$)", min_value=1e-9, max_value=1.0,
+                                       value=1e-3, format="%.0e")
+
+# --- CURVE CACHE ---
+# Keyed on the stacked material properties and grid parameters in the process-wide cache, so a scenario is
+# computed once per server for all sessions and served without copying; bounded by the bytes it holds.
+# Misses fall through to the on-disk cache, so scenarios seen before a restart are not recomputed either.
+# CURVE_RESOLUTION caps the adaptive grid, which only spends points where log(I/I0) bends
+CURVE_RESOLUTION = 200
+
+@memoize(disk=DISK_CACHE)
+def compute_curves(energies, intensities, b_slope, max_thick, resolution, model="linear"):
+    evaluate = lambda x: spectrum_transmission(x, energies, intensities, b_slope, model=model)
+    return adaptive_thickness_grid(evaluate, max_thick, max_points=resolution)
+
+@memoize(disk=DISK_CACHE)
+def compute_thickness_table(energies, intensities, design_limit):
+    # Narrow-beam HVL/TVL and the broad-beam (with build-up) thickness that meets the design limit,
+    # all spectrum-weighted; for a single line these reduce to ln(2)/mu, ln(10)/mu and required_thickness
+    hvl_values, tvl_values = spectrum_required_thickness([0.5, 0.1], energies, intensities, use_buildup=False).T
+    return hvl_values, tvl_values, spectrum_required_thickness(design_limit, energies, intensities)[:, 0]
 
 # --- VISUALIZATION ---
-st.subheader("📊 Comparative Attenuation Curves (Broad-Beam)")
+PLOT_WIDTH_PX = 1200
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_chart(energies, intensities, b_slope, max_thick, resolution, model="linear"):
+    # Rasterized once per parameter set; the figure is closed so reruns never accumulate open figures
+    # pyplot is imported here so cold starts only pay for it when a chart is actually rendered
+    import matplotlib.pyplot as plt
 
-fig, ax = plt.subplots(figsize=(12, 6))
-x_vals = np.linspace(0, max_thick, 200)
+    x_vals, y_matrix = compute_curves(energies, intensities, b_slope, max_thick, resolution, model)
+    # A 12-inch figure has ~1200 x-pixels. The adaptive grid (CURVE_RESOLUTION points) normally fits and is
+    # plotted as is; only a denser grid is cut to a min and max per two-pixel-wide column
+    x_plot, y_plot = minmax_downsample(x_vals, y_matrix, PLOT_WIDTH_PX // 2)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    try:
+        for name, x_row, y_vals in zip(MATERIAL_NAMES, x_plot, y_plot):
+            ax.plot(x_row, y_vals, label=name, color=MATERIALS[name]['color'], lw=2.5)
 
-for name, props in MATERIALS.items():
-    y_vals = calculate_attenuation(x_vals, props['mu'], props['b_slope'])
-    ax.plot(x_vals, y_vals, label=name, color=props['color'], lw=2.5)
+        ax.set_yscale('log') # Standard for shielding curves
+        ax.set_ylim(1e-4, 1.1)
+        ax.set_xlabel("Shield Thickness (cm)")
+        ax.set_ylabel("Transmission Ratio ($I/I_0$)")
+        ax.grid(True, which="both", ls="-", alpha=0.2)
+        ax.set_title("Photon Attenuation with Scatter Build-up Correction")
+        ax.legend()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buf.getvalue()
 
-ax.set_yscale('log') # Standard for shielding curves
-ax.set_ylim(1e-4, 1.1)
-ax.set_xlabel("Shield Thickness (cm)")
-ax.set_ylabel("Transmission Ratio ($I/I_0$)")
-ax.grid(True, which="both", ls="-", alpha=0.2)
-ax.set_title("Photon Attenuation with Scatter Build-up Correction")
-ax.legend()
-st.pyplot(fig)
+def interactive_chart(x_vals, y_matrix):
+    # Client-rendered Vega-Lite spec: the curve arrays ship once and zoom/pan/hover run in the browser.
+    # altair and pandas load lazily, only when this renderer is chosen.
+    import altair as alt
+    import pandas as pd
 
+    data = pd.DataFrame({
+        "Thickness (cm)": np.tile(x_vals, len(MATERIAL_NAMES)),
+        "Transmission": y_matrix.ravel(),
+        "Material": np.repeat(MATERIAL_NAMES, len(x_vals)),
+    })
+    data = data[data["Transmission"] > 0]  # log scale
+    return alt.Chart(data, title="Photon Attenuation with Scatter Build-up Correction").mark_line(
+        strokeWidth=2.5).encode(
+        x="Thickness (cm):Q",
+        y=alt.Y("Transmission:Q", title="Transmission Ratio (I/I0)",
+                scale=alt.Scale(type="log", domain=[1e-4, 1.1], clamp=True)),
+        color=alt.Color("Material:N", scale=alt.Scale(domain=MATERIAL_NAMES,
+                                                      range=[MATERIALS[n]['color'] for n in MATERIAL_NAMES])),
+        tooltip=["Material", alt.Tooltip("Thickness (cm):Q", format=".2f"),
+                 alt.Tooltip("Transmission:Q", format=".3e")],
+    ).properties(height=500).interactive()
 
+@st.fragment
+def attenuation_chart_section():
+    st.subheader("📊 Comparative Attenuation Curves (Broad-Beam)")
+    thick_col, model_col, renderer_col = st.columns(3)
+    max_thick = thick_col.slider("Max Analysis Thickness (cm)", 10, 100, 50)
+    buildup_model = BUILDUP_MODEL_LABELS[model_col.selectbox("Build-up Model", list(BUILDUP_MODEL_LABELS))]
+    chart_renderer = renderer_col.radio("Chart Renderer", ["Static (Matplotlib)", "Interactive (Vega-Lite)"],
+                                        horizontal=True,
+                                        help="Interactive charts pan, zoom and show tooltips in the browser "
+                                             "without a rerun.")
+
+    if chart_renderer.startswith("Interactive"):
+        curve_x, curve_y = compute_curves(*source_lines, tuple(B_SLOPE_STACK), max_thick, CURVE_RESOLUTION,
+                                          buildup_model)
+        st.altair_chart(interactive_chart(curve_x, curve_y), width="stretch")
+    else:
+        st.image(render_chart(*source_lines, tuple(B_SLOPE_STACK), max_thick, CURVE_RESOLUTION, buildup_model),
+                 width="stretch")
+
+attenuation_chart_section()
 
 # --- DATA TABLE & INSIGHTS ---
 st.divider()
-cols = st.columns(len(MATERIALS))
-
-for i, (name, props) in enumerate(MATERIALS.items()):
-    hvl = np.log(2) / props['mu']
-    tenth_value = np.log(10) / props['mu']
-    cols[i].metric(name, f"{hvl:.2f} cm")
-    cols[i].caption(f"HVL (Half-Value Layer)")
-    cols[i].write(f"**TVL:** {tenth_value:.1f} cm")
+
+@st.fragment
+def shielding_metrics_section():
+    cols = st.columns(len(MATERIALS))
+
+    hvl_values, tvl_values, design_values = compute_thickness_table(*source_lines, float(design_limit))
+
+    for i, (name, hvl, tenth_value, design_thick) in enumerate(zip(MATERIAL_NAMES, hvl_values, tvl_values,
+                                                                   design_values)):
+        cols[i].metric(name, f"{hvl:.2f} cm")
+        cols[i].caption(f"HVL (Half-Value Layer)")
+        cols[i].write(f"**TVL:** {tenth_value:.1f} cm")
+        cols[i].write(f"**Design Thickness (linear B):** {design_thick:.1f} cm")
+
+shielding_metrics_section()
+
+# --- MULTI-LAYER SHIELD ---
+st.divider()
+
+@st.fragment
+def multilayer_section():
+    st.subheader("🧱 Multi-Layer Shield")
+    layer_names = st.multiselect("Layer Order (source side first)", MATERIAL_NAMES,
+                                 default=["Lead (Pb)", "Concrete"])
+    buildup_rule = st.selectbox("Build-up Combination Rule", BUILDUP_RULES)
+    if not layer_names:
+        return
+
+    layer_cols = st.columns(len(layer_names))
+    layer_thick = [layer_cols[i].number_input(f"{name} (cm)", 0.0, 500.0, 5.0, key=f"layer_{name}")
+                   for i, name in enumerate(layer_names)]
+    layer_mu, layer_b = stack_coefficients(layer_names, source_energy)
+    stack_t = layered_transmission(layer_thick, layer_mu, layer_b, rule=buildup_rule)
+    st.metric("Stack Transmission ($I/I_0$)", f"{stack_t:.2e}")
+
+    # Searches orders and thicknesses of the selected materials for the cheapest stack meeting the design limit
+    opt_objective = st.selectbox("Optimize For", OBJECTIVES)
+    if st.button("Optimize Stack"):
+        best = optimize_stack(layer_names, design_limit, source_energy, n_layers=len(layer_names),
+                              objective=opt_objective, rule=buildup_rule, seed=0)[0]
+        st.write(" → ".join(f"{name}: {t:.1f} cm" for name, t in zip(best["layers"], best["thickness"]) if t > 0))
+        st.caption(f"Objective ({opt_objective}): {best['objective']:.3g} per unit area "
+                   f"at $I/I_0$ = {design_limit:.0e}")
+
+multilayer_section()
+
+# --- MONTE CARLO VALIDATION ---
+# Workers never fork the threaded server process, and one run cannot take every core of a shared host
+MC_PROCESSES = min(4, os.cpu_count() or 1)
+MC_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+@st.fragment
+def monte_carlo_section():
+    with st.expander("🎲 Monte Carlo Validation of the Build-up Approximation"):
+        mc_material = st.selectbox("Material", MATERIAL_NAMES, key="mc_material")
+        mc_photons = st.select_slider("Photons per Thickness", [10_000, 50_000, 200_000, 1_000_000], value=50_000)
+        mc_depth = st.select_slider("Max Depth (mfp)", [2, 4, 6, 8], value=8)
+        if st.button("Run Simulation"):
+            # Beyond ~8 mfp almost nothing is transmitted, so the sampled depths stop there
+            mc_mu = MU_STACK[MATERIAL_NAMES.index(mc_material)]
+            mc_thick = np.linspace(0, mc_depth / mc_mu, 6)[1:]
+            mc = simulate_buildup(mc_material, source_energy, mc_thick, n_photons=mc_photons,
+                                  processes=MC_PROCESSES, seed=0, mp_context=MC_CONTEXT)
+            st.dataframe({
+                "Thickness (cm)": mc["thickness"],
+                "mfp": mc["mfp"],
+                "Analytic B": mc["buildup_analytic"],
+                "MC B (number)": mc["buildup_number"],
+                "MC B (energy)": mc["buildup_energy"],
+                "± (energy)": mc["buildup_energy_err"],
+            }, hide_index=True)
+            st.caption("Pencil beam on a slab; MC build-up is transmitted photons relative to the uncollided "
+                       "transmission. Deep points with few transmitted photons carry large statistical error.")
+
+monte_carlo_section()
+
+# --- MIXTURES & CROSS-SECTION LIBRARY ---
+def thickness_table(names, mu, b_slope):
+    # Single-energy mu, HVL, TVL and design thickness for materials outside the built-in stacks
+    st.dataframe({
+        "Material": names,
+        "μ (cm⁻¹)": mu,
+        "HVL (cm)": half_value_layer(mu),
+        "TVL (cm)": tenth_value_layer(mu),
+        "Design Thickness (linear B) (cm)": required_thickness(design_limit, mu, b_slope)[:, 0],
+    }, hide_index=True)
+    st.caption(f"At {source_energy:.3f} MeV and $I/I_0$ = {design_limit:.0e}.")
+
+@st.fragment
+def mixtures_section():
+    with st.expander("🧪 Compound & Mixture Materials"):
+        thickness_table(list(MIXTURES), mixture_attenuation(source_energy),
+                        np.array([spec["b_slope"] for spec in MIXTURES.values()]))
+        st.caption("μ from elemental mass fractions: " + "; ".join(
+            f"**{name}** " + ", ".join(f"{el} {w:.3g}" for el, w in spec["composition"].items())
+            for name, spec in MIXTURES.items()))
+
+mixtures_section()
+
+# Optional on-disk library (SHIELDING_XSDB=<dir>), mapped once per server; only the selected rows are read
+@st.cache_resource
+def cross_section_library():
+    return library_from_env()
+
+XSDB = cross_section_library()
+
+@st.fragment
+def library_section():
+    with st.expander(f"📚 Cross-Section Library ({len(XSDB['names'])} materials)"):
+        picked = st.multiselect("Materials", XSDB["names"], key="xsdb_materials")
+        if picked:
+            thickness_table(picked, *library_coefficients(XSDB, picked, source_energy))
+
+if XSDB is not None:
+    library_section()
 
 st.info("""
 **Engineering Note:** The **Build-up Factor** accounts for photons that undergo Compton scattering 
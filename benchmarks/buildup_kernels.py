@@ -0,0 +1,32 @@
+# Cost and accuracy of every registered build-up kernel.
+# Usage: python benchmarks/buildup_kernels.py [--points N] [--max-mfp M]
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shielding import (MATERIAL_NAMES, BUILDUP_FITS, GP_ENERGY_GRID_MEV, benchmark_buildup_models,
+                       fitted_coefficients)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build-up kernel cost and accuracy")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--max-mfp", type=float, default=20.0)
+    args = parser.parse_args()
+
+    timings = benchmark_buildup_models(args.points)
+    print(f"Kernel cost on {args.points:,} points")
+    for model, seconds in sorted(timings.items(), key=lambda item: item[1]):
+        print(f"  {model:<8} {seconds * 1e3:8.2f} ms  ({seconds / args.points * 1e9:6.2f} ns/point)")
+
+    print(f"\nMax relative error vs GP over [0, {args.max_mfp:g}] mfp")
+    print("  " + f"{'model':<8} {'E (MeV)':>8}  " + "  ".join(f"{name[:12]:>12}" for name in MATERIAL_NAMES))
+    for model in BUILDUP_FITS:
+        for energy in GP_ENERGY_GRID_MEV:
+            error = fitted_coefficients(model, float(energy), args.max_mfp)[1]
+            print(f"  {model:<8} {energy:8.2f}  " + "  ".join(f"{e:12.3f}" for e in error))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# Cold-import budget check: each module is imported in a fresh interpreter so caches do not hide the cost.
+# Usage: python benchmarks/import_time.py [--repeat N]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in milliseconds for a cold `import <module>`
+BUDGETS_MS = {
+    "shielding": 250,
+    "streamlit": 1500,
+    "matplotlib.pyplot": 1000,
+}
+
+def cold_import_ms(module, repeat=5):
+    # Best-of-N wall time measured inside the child so interpreter startup is excluded
+    code = ("import time; t = time.perf_counter(); import {0}; "
+            "print((time.perf_counter() - t) * 1e3)").format(module)
+    env = dict(os.environ, MPLBACKEND="Agg")
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip()))
+    return min(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-import budget check")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = False
+    for module, budget in BUDGETS_MS.items():
+        elapsed = cold_import_ms(module, args.repeat)
+        status = "ok" if elapsed <= budget else "OVER"
+        over_budget |= elapsed > budget
+        print(f"{module:<20} {elapsed:8.1f} ms  (budget {budget} ms)  {status}")
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# Lookup-table transmission against the direct kernels: cost and observed error.
+# Usage: python benchmarks/lookup_tables.py [--points N] [--energy E] [--max-mfp M]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shielding import (BUILDUP_MODELS, B_SLOPE_STACK, linear_attenuation, buildup_coefficients,
+                       calculate_attenuation_batch, build_table, lut_transmission)
+
+def best_of(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Lookup-table transmission cost and accuracy")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--energy", type=float, default=0.662)
+    parser.add_argument("--max-mfp", type=float, default=30.0)
+    args = parser.parse_args()
+
+    mu = linear_attenuation(args.energy)
+    x = np.linspace(0, args.max_mfp / mu.min(), args.points)
+    print(f"{args.points:,} thicknesses per material at {args.energy:g} MeV (up to {args.max_mfp:g} mfp)")
+    print(f"  {'model':<8} {'direct':>10} {'table':>10}  {'observed':>9}  {'table bound':>11}")
+    for model in BUILDUP_MODELS:
+        lut = build_table(model)
+        coeffs = buildup_coefficients(model, args.energy)
+        direct = lambda: calculate_attenuation_batch(x, mu, B_SLOPE_STACK, model=model, coeffs=coeffs)
+        table = lambda: lut_transmission(lut, x, args.energy)
+        exact = direct()
+        mask = exact > 1e-12
+        observed = np.abs(table()[mask] / exact[mask] - 1).max()
+        print(f"  {model:<8} {best_of(direct) * 1e3:8.1f} ms {best_of(table) * 1e3:8.1f} ms  "
+              f"{observed:9.2e}  {lut['max_rel_error']:11.2e}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
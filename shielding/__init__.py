@@ -0,0 +1,29 @@
+# Headless shielding physics engine: importable without Streamlit or Matplotlib
+from .materials import (ENERGY_GRID_MEV, MATERIALS, MATERIAL_NAMES, B_SLOPE_STACK, DENSITY_STACK,
+                        COST_STACK, Z_OVER_A_STACK, LOG_ENERGY_GRID, LOG_MU_RHO_TABLE,
+                        log_log_interpolate, linear_attenuation)
+from .buildup import (GP_ENERGY_GRID_MEV, GP_COEFFICIENTS, GP_TABLE, BUILDUP_MODELS, BUILDUP_FITS,
+                      linear_buildup, berger_buildup, taylor_buildup, gp_buildup, gp_coefficients,
+                      buildup_coefficients, fitted_coefficients, benchmark_buildup_models,
+                      select_buildup_model)
+from .attenuation import (calculate_attenuation, calculate_attenuation_batch,
+                          half_value_layer, tenth_value_layer)
+from .solver import required_thickness
+from .layers import BUILDUP_RULES, stack_coefficients, combine_buildup, layered_transmission
+from .optimize import OBJECTIVES, optimize_stack
+from .montecarlo import klein_nishina_cross_section, sample_compton, simulate_buildup
+from .pointkernel import (line_source, disk_source, cylinder_source, box_source, slab_path_lengths,
+                          point_kernel_flux)
+from .dosemap import wall_path_lengths, dose_map
+from .raytrace import voxel_path_lengths, voxel_transmission, voxel_dose
+from .spectrum import (SOURCE_SPECTRA, histogram_spectrum, spectrum_weights, mean_energy, spectrum_transmission,
+                       spectrum_required_thickness)
+from .sampling import adaptive_thickness_grid, minmax_downsample
+from .cache import (DEFAULT_MAX_BYTES, SharedCache, SHARED_CACHE, cache_key, MATERIAL_FINGERPRINT,
+                    SOURCE_FINGERPRINT, function_fingerprint, DiskCache, DISK_CACHE, memoize)
+from .lut import (DEFAULT_LUT_DIR, build_table, save_table, load_table, load_or_build_table,
+                  lut_transmission)
+from .xsdb import (write_library, export_builtin_library, open_library, library_rows, library_attenuation,
+                   library_coefficients, library_from_env)
+from .mixtures import (ATOMIC_DATA, ELEMENT_MU_RHO, ELEMENT_NAMES, ELEMENT_MU_RHO_TABLE, MIXTURES, mass_fractions,
+                       mixture_table, mixture_attenuation, export_mixture_library)
@@ -0,0 +1,42 @@
+# Command line:
+#   python -m shielding lut [--dir D] [--models linear gp ...] [--n-energy N] [--n-mfp N] [--max-mfp M]
+#   python -m shielding xsdb DIR
+import argparse
+import sys
+
+from .buildup import BUILDUP_MODELS
+from .lut import DEFAULT_LUT_DIR, build_table, save_table
+from .xsdb import export_builtin_library
+
+def build_lookup_tables(args):
+    for model in args.models:
+        lut = build_table(model, n_energy=args.n_energy, n_mfp=args.n_mfp, max_mfp=args.max_mfp)
+        path = save_table(lut, args.dir)
+        print(f"{model:<8} {lut['table'].shape}  {lut['table'].nbytes / 2**20:6.1f} MiB  "
+              f"max rel error {lut['max_rel_error']:.2e}  max abs error {lut['max_abs_error']:.2e}  -> {path}")
+
+def export_cross_sections(args):
+    print(f"Wrote {export_builtin_library(args.dir)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m shielding", description="Shielding data build tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    lut = commands.add_parser("lut", help="build transmission lookup tables and report their interpolation error")
+    lut.add_argument("--dir", default=str(DEFAULT_LUT_DIR))
+    lut.add_argument("--models", nargs="+", default=["linear"], choices=list(BUILDUP_MODELS))
+    lut.add_argument("--n-energy", type=int, default=64)
+    lut.add_argument("--n-mfp", type=int, default=None)
+    lut.add_argument("--max-mfp", type=float, default=40.0)
+    lut.set_defaults(run=build_lookup_tables)
+
+    xsdb = commands.add_parser("xsdb", help="export the built-in materials as a memory-mapped cross-section library")
+    xsdb.add_argument("dir")
+    xsdb.set_defaults(run=export_cross_sections)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
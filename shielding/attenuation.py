@@ -0,0 +1,41 @@
+import numpy as np
+
+from .buildup import BUILDUP_MODELS
+
+# --- PHYSICS LOGIC ---
+def _require_coeffs(model, coeffs):
+    # Only the linear model can fall back to b_slope; the others need their packed coefficients
+    if coeffs is None:
+        raise ValueError(f"Build-up model {model!r} needs coeffs, e.g. from buildup_coefficients({model!r}, energy)")
+
+def calculate_attenuation(thickness_range, mu, b_slope, use_buildup=True, model="linear", coeffs=None):
+    # Mean free paths (mfp)
+    mfp = mu * thickness_range
+    # Linear Build-up Approximation: B = 1 + (b_slope * mfp), or any registered model given its coeffs
+    if model == "linear" and coeffs is None:
+        coeffs = np.asarray([b_slope], dtype=float)
+    elif use_buildup:
+        _require_coeffs(model, coeffs)
+    B = BUILDUP_MODELS[model](mfp, np.asarray(coeffs, dtype=float)) if use_buildup else 1.0
+    # Transmission (I/I0)
+    transmission = B * np.exp(-mfp)
+    return transmission
+
+def calculate_attenuation_batch(thickness_range, mu, b_slope, use_buildup=True, model="linear", coeffs=None):
+    # Same model for every material at once: (n_materials,) x (n_thickness,) -> (n_materials, n_thickness)
+    # coeffs (n_materials, n_params) selects another registered build-up model, e.g. GP from gp_coefficients()
+    mu = np.asarray(mu, dtype=float)[:, np.newaxis]
+    mfp = mu * np.asarray(thickness_range, dtype=float)[np.newaxis, :]
+    if model == "linear" and coeffs is None:
+        coeffs = np.asarray(b_slope, dtype=float)[:, np.newaxis]
+    elif use_buildup:
+        _require_coeffs(model, coeffs)
+    B = BUILDUP_MODELS[model](mfp, np.asarray(coeffs, dtype=float)[:, np.newaxis, :]) if use_buildup else 1.0
+    return B * np.exp(-mfp)
+
+def half_value_layer(mu):
+    # Narrow-beam HVL (cm) from mu (cm^-1); works on scalars or stacked arrays
+    return np.log(2) / np.asarray(mu, dtype=float)
+
+def tenth_value_layer(mu):
+    return np.log(10) / np.asarray(mu, dtype=float)
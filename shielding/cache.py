@@ -0,0 +1,270 @@
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+
+from .materials import ENERGY_GRID_MEV, MATERIAL_NAMES, B_SLOPE_STACK, DENSITY_STACK, LOG_MU_RHO_TABLE
+from .buildup import GP_TABLE
+
+# --- SHARED RESULT CACHE ---
+# One process-wide LRU shared by every Streamlit session (the script runner gives each session its own thread).
+# Size is bounded by the bytes of the cached arrays rather than an entry count, entries may expire after `ttl`
+# seconds, and a key is computed once: concurrent misses wait for the first caller instead of recomputing.
+# Every caller gets the same objects back, so cached arrays are made read-only.
+DEFAULT_MAX_BYTES = 256 << 20
+SCALAR_BYTES = 64  # rough allowance for anything that is not an array
+
+def value_nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(value_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(value_nbytes(v) for v in value.values())
+    return SCALAR_BYTES
+
+def freeze(value):
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            freeze(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            freeze(v)
+    return value
+
+def cache_key(*parts):
+    # Hashable key; arrays are keyed by dtype, shape and contents
+    return tuple((p.dtype.str, p.shape, p.tobytes()) if isinstance(p, np.ndarray)
+                 else cache_key(*p) if isinstance(p, (tuple, list)) else p for p in parts)
+
+class SharedCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()   # key -> (value, nbytes, stored_at), least recently used first
+        self._inflight = {}             # key -> threading.Event set when the computing caller finishes
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _discard(self, key):
+        _, nbytes, _ = self._entries.pop(key)
+        self._nbytes -= nbytes
+
+    def get_or_compute(self, key, compute):
+        while True:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry[0]
+                event = self._inflight.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = self._inflight[key] = threading.Event()
+                    break
+            # Another session is computing this key; retry once it is done (or has failed)
+            event.wait()
+
+        try:
+            value = freeze(compute())
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def put(self, key, value):
+        nbytes = value_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, nbytes, time.monotonic())
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = self.misses = 0
+
+SHARED_CACHE = SharedCache()
+
+# --- DISK CACHE ---
+# Results persisted as .npz files (one array, or a tuple of arrays) so warm restarts skip recomputation.
+# File names are the sha256 of the key together with fingerprints of the material data and of the package
+# sources, and memoize() keys on the decorated function's own source, so editing MATERIALS, the build-up tables
+# or any computation never serves stale results after a deployment. Reads refresh the file's mtime and writes
+# evict the least recently used files once the directory exceeds max_bytes. Writes go through a temporary file
+# and an atomic rename, so concurrent processes never see a partial file; temporaries left by crashed writes
+# are counted and removed once stale. I/O errors fall back to computing; unreadable files are removed.
+CACHE_FORMAT_VERSION = 1
+DEFAULT_DISK_BYTES = 1 << 30
+STALE_TMP_SECONDS = 3600
+DEFAULT_CACHE_DIR = Path(os.environ.get("SHIELDING_CACHE_DIR", Path.home() / ".cache" / "shielding"))
+
+def _fingerprint():
+    digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}|{MATERIAL_NAMES}".encode())
+    for table in (ENERGY_GRID_MEV, LOG_MU_RHO_TABLE, DENSITY_STACK, B_SLOPE_STACK, GP_TABLE):
+        digest.update(np.ascontiguousarray(table, dtype=float).tobytes())
+    return digest.hexdigest()
+
+MATERIAL_FINGERPRINT = _fingerprint()
+
+def _source_fingerprint():
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+SOURCE_FINGERPRINT = _source_fingerprint()
+
+def function_fingerprint(func):
+    # Source of the function itself, for callers outside the package (e.g. the app's cached helpers)
+    try:
+        code = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = func.__code__.co_code
+    return hashlib.sha256(code).hexdigest()
+
+def _pack(value):
+    if isinstance(value, np.ndarray):
+        return {"value": value}
+    if isinstance(value, tuple) and all(isinstance(v, np.ndarray) for v in value):
+        return {f"item_{i}": v for i, v in enumerate(value)}
+    raise TypeError(f"Disk cache stores arrays or tuples of arrays, not {type(value).__name__}")
+
+def _unpack(data):
+    if "value" in data.files:
+        return data["value"]
+    return tuple(data[f"item_{i}"] for i in range(len(data.files)))
+
+class DiskCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_DISK_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def path(self, key):
+        digest = hashlib.sha256(f"{MATERIAL_FINGERPRINT}|{SOURCE_FINGERPRINT}|{key!r}".encode()).hexdigest()
+        return self.directory / f"{digest}.npz"
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                value = _unpack(data)
+        except (ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            # Truncated or corrupt: removed so the caller's recomputed result replaces it
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return None
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # read-only directory: the file just keeps its old eviction rank
+        return value
+
+    def put(self, key, value):
+        arrays = _pack(value)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return  # read-only or missing directory: results simply are not persisted
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, self.path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def evict(self):
+        files = []
+        now = time.time()
+        for path in [*self.directory.glob("*.npz"), *self.directory.glob("*.tmp")]:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # removed by another process
+            if path.suffix == ".tmp" and now - stat.st_mtime > STALE_TMP_SECONDS:
+                path.unlink(missing_ok=True)  # left behind by a crashed write
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in [*self.directory.glob("*.npz"), *self.directory.glob("*.tmp")]:
+            path.unlink(missing_ok=True)
+
+DISK_CACHE = DiskCache()
+
+def memoize(cache=SHARED_CACHE, disk=None):
+    # Decorator: results keyed by the function and its arguments in `cache`; with `disk`, misses are first
+    # looked up on disk and new results written there
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        code = function_fingerprint(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = cache_key(name, code, args, tuple(sorted(kwargs.items())))
+            compute = lambda: func(*args, **kwargs)
+            if disk is not None:
+                compute = lambda compute=compute: disk.get_or_compute(key, compute)
+            return cache.get_or_compute(key, compute)
+        wrapper.cache = cache
+        wrapper.disk = disk
+        return wrapper
+    return decorator
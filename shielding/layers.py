@@ -0,0 +1,44 @@
+import numpy as np
+
+from .materials import MATERIAL_NAMES, B_SLOPE_STACK, linear_attenuation
+
+# --- MULTI-LAYER SHIELDS ---
+# Layers are ordered source side first. Total mfp is the sum over layers; the stack build-up slope is
+# combined from the per-layer slopes by one of the rules below:
+#   last     - slope of the outermost (detector-side) layer, the usual approximation for the build-up
+#              spectrum seen at the detector
+#   max      - largest slope in the stack, conservative
+#   weighted - mfp-weighted mean of the layer slopes
+BUILDUP_RULES = ("last", "max", "weighted")
+
+def stack_coefficients(names, energy_mev):
+    # mu (cm^-1) and b_slope for an ordered list of MATERIALS entries
+    idx = [MATERIAL_NAMES.index(name) for name in names]
+    return linear_attenuation(energy_mev)[idx], B_SLOPE_STACK[idx]
+
+def combine_buildup(layer_mfp, b_slope, rule="last"):
+    # layer_mfp (..., n_layers) and b_slope broadcastable to it -> effective slope (...)
+    layer_mfp = np.asarray(layer_mfp, dtype=float)
+    b_slope = np.broadcast_to(np.asarray(b_slope, dtype=float), layer_mfp.shape)
+    present = layer_mfp > 0
+
+    if rule == "last":
+        n_layers = layer_mfp.shape[-1]
+        last = n_layers - 1 - np.argmax(present[..., ::-1], axis=-1)
+        b_eff = np.take_along_axis(b_slope, last[..., np.newaxis], axis=-1)[..., 0]
+        return np.where(present.any(axis=-1), b_eff, 0.0)
+    if rule == "max":
+        return np.where(present, b_slope, 0.0).max(axis=-1)
+    if rule == "weighted":
+        total = layer_mfp.sum(axis=-1)
+        weighted = (b_slope * layer_mfp).sum(axis=-1)
+        return np.divide(weighted, total, out=np.zeros_like(total), where=total > 0)
+    raise ValueError(f"Unknown build-up rule {rule!r}; expected one of {BUILDUP_RULES}")
+
+def layered_transmission(thicknesses, mu, b_slope, rule="last", use_buildup=True):
+    # thicknesses (..., n_layers) in cm, e.g. (n_configs, n_layers) for a design sweep;
+    # mu and b_slope are (n_layers,) or per-config (..., n_layers) -> transmission (...)
+    layer_mfp = np.asarray(mu, dtype=float) * np.asarray(thicknesses, dtype=float)
+    mfp = layer_mfp.sum(axis=-1)
+    B = 1 + combine_buildup(layer_mfp, b_slope, rule) * mfp if use_buildup else 1.0
+    return B * np.exp(-mfp)
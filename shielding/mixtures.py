@@ -0,0 +1,101 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .materials import ENERGY_GRID_MEV, MATERIALS, linear_attenuation
+from .xsdb import write_library
+
+# --- ELEMENTAL CROSS SECTIONS (same 0.1 - 10 MeV grid as MATERIALS) ---
+# mu_rho: Mass Attenuation (cm^2/g), NIST XCOM / Hubbell-Seltzer total with coherent, rounded to 4 figures;
+# Fe, W and Pb reuse the MATERIALS rows. Check against NIST before relying on a design value.
+TABULATED_MU_RHO = {
+    "H": [0.2944, 0.2651, 0.2429, 0.2112, 0.1893, 0.1729, 0.1599, 0.1405, 0.1263,
+          0.1129, 0.1027, 0.08769, 0.06921, 0.05806, 0.05049, 0.04498, 0.03746, 0.03254],
+    "C": [0.1514, 0.1347, 0.1229, 0.1066, 0.09546, 0.08715, 0.08058, 0.07076, 0.06361,
+          0.05690, 0.05179, 0.04442, 0.03562, 0.03047, 0.02708, 0.02469, 0.02154, 0.01959],
+    "N": [0.1529, 0.1353, 0.1233, 0.1068, 0.09557, 0.08719, 0.08063, 0.07081, 0.06364,
+          0.05693, 0.05180, 0.04450, 0.03579, 0.03073, 0.02742, 0.02511, 0.02209, 0.02024],
+    "O": [0.1551, 0.1361, 0.1237, 0.1070, 0.09566, 0.08729, 0.08070, 0.07087, 0.06372,
+          0.05697, 0.05185, 0.04459, 0.03597, 0.03100, 0.02777, 0.02552, 0.02263, 0.02089],
+    "Mg": [0.1604, 0.1366, 0.1230, 0.1058, 0.09441, 0.08610, 0.07957, 0.06981, 0.06274,
+           0.05609, 0.05110, 0.04409, 0.03606, 0.03159, 0.02883, 0.02698, 0.02470, 0.02346],
+    "Al": [0.1704, 0.1378, 0.1223, 0.1042, 0.09276, 0.08445, 0.07802, 0.06841, 0.06146,
+           0.05496, 0.05006, 0.04324, 0.03541, 0.03106, 0.02836, 0.02655, 0.02437, 0.02318],
+    "Si": [0.1835, 0.1448, 0.1275, 0.1082, 0.09614, 0.08748, 0.08077, 0.07082, 0.06361,
+           0.05688, 0.05183, 0.04480, 0.03678, 0.03240, 0.02967, 0.02788, 0.02574, 0.02462],
+    "Fe": MATERIALS["Iron (Fe)"]["mu_rho"],
+    "W": MATERIALS["Tungsten (W)"]["mu_rho"],
+    "Pb": MATERIALS["Lead (Pb)"]["mu_rho"],
+}
+# (Z, atomic mass) for every supported element
+ATOMIC_DATA = {"H": (1, 1.008), "B": (5, 10.81), "C": (6, 12.011), "N": (7, 14.007), "O": (8, 15.999),
+               "Na": (11, 22.990), "Mg": (12, 24.305), "Al": (13, 26.982), "Si": (14, 28.085), "K": (19, 39.098),
+               "Ca": (20, 40.078), "Cr": (24, 51.996), "Fe": (26, 55.845), "Ni": (28, 58.693),
+               "W": (74, 183.84), "Pb": (82, 207.2)}
+
+# Elements without a tabulated row are derived per electron: (mu/rho) / (Z/A) is fitted at every energy to
+# a + b Z^3.5 + c Z (Compton + coherent, photoelectric, pair production) over the tabulated C..Fe rows and
+# scaled back by Z/A. Between 0.3 and 3 MeV this is Compton-dominated and good to ~1%; at 0.1 MeV and above
+# 5 MeV expect a few percent.
+FIT_ELEMENTS = ("C", "N", "O", "Mg", "Al", "Si", "Fe")
+
+def _per_electron_basis(element):
+    z, _ = ATOMIC_DATA[element]
+    return np.array([1.0, z ** 3.5, z])
+
+def _derived_mu_rho():
+    per_electron = [np.array(TABULATED_MU_RHO[e]) * ATOMIC_DATA[e][1] / ATOMIC_DATA[e][0] for e in FIT_ELEMENTS]
+    basis = np.stack([_per_electron_basis(e) for e in FIT_ELEMENTS])
+    fit = np.linalg.lstsq(basis, np.stack(per_electron), rcond=None)[0]     # (3, n_energies)
+    return {e: _per_electron_basis(e) @ fit * ATOMIC_DATA[e][0] / ATOMIC_DATA[e][1]
+            for e in ATOMIC_DATA if e not in TABULATED_MU_RHO}
+
+ELEMENT_MU_RHO = {**TABULATED_MU_RHO, **_derived_mu_rho()}
+ELEMENT_NAMES = sorted(ELEMENT_MU_RHO, key=lambda e: ATOMIC_DATA[e][0])
+ELEMENT_INDEX = {element: i for i, element in enumerate(ELEMENT_NAMES)}
+# (n_elements, n_energies); mixtures combine mu/rho linearly by mass fraction, so this is kept unlogged
+ELEMENT_MU_RHO_TABLE = np.ascontiguousarray([ELEMENT_MU_RHO[e] for e in ELEMENT_NAMES], dtype=float)
+
+# --- EXAMPLE MIXTURES ---
+# composition: element -> mass fraction (normalized on use) | density: g/cm^3 | b_slope: Approximate build-up slope
+MIXTURES = {
+    "Borated Polyethylene (5% B)": {"density": 1.01, "b_slope": 3.1,
+                                    "composition": {"H": 0.1365, "C": 0.8135, "B": 0.05}},
+    "Ordinary Concrete (NIST)": {"density": 2.30, "b_slope": 2.5,
+                                 "composition": {"H": 0.022100, "C": 0.002484, "O": 0.574930, "Na": 0.015208,
+                                                 "Mg": 0.001266, "Al": 0.019953, "Si": 0.304627, "K": 0.010045,
+                                                 "Ca": 0.042951, "Fe": 0.006435}},
+    "Carbon Steel": {"density": 7.85, "b_slope": 1.8, "composition": {"Fe": 0.995, "C": 0.005}},
+    "Stainless Steel 304": {"density": 8.00, "b_slope": 1.8, "composition": {"Fe": 0.715, "Cr": 0.19, "Ni": 0.095}},
+}
+
+@lru_cache(maxsize=4096)
+def mass_fractions(composition):
+    # composition: tuple of (element, weight) pairs -> normalized (n_elements,) row, read-only
+    unknown = [element for element, _ in composition if element not in ELEMENT_INDEX]
+    if unknown:
+        raise ValueError(f"No cross sections for {', '.join(unknown)}; expected elements from {ELEMENT_NAMES}")
+    row = np.zeros(len(ELEMENT_NAMES))
+    for element, weight in composition:
+        row[ELEMENT_INDEX[element]] += weight
+    row /= row.sum()
+    row.setflags(write=False)
+    return row
+
+def mixture_table(mixtures=MIXTURES):
+    # {name: {"density", "composition", ...}} -> (names, mu/rho (n_mixtures, n_energies), density (n_mixtures,)).
+    # Fraction rows are cached per composition; the whole library is then one matrix multiply.
+    weights = np.stack([mass_fractions(tuple(sorted(spec["composition"].items()))) for spec in mixtures.values()])
+    density = np.array([spec["density"] for spec in mixtures.values()], dtype=float)
+    return list(mixtures), weights @ ELEMENT_MU_RHO_TABLE, density
+
+def mixture_attenuation(energy_mev, mixtures=MIXTURES):
+    # mu (cm^-1) for every mixture: (n_mixtures,) or (n_mixtures, *energy.shape)
+    _, mu_rho, density = mixture_table(mixtures)
+    return linear_attenuation(energy_mev, np.log(mu_rho), density)
+
+def export_mixture_library(directory, mixtures=MIXTURES):
+    # Mixtures as a memory-mapped cross-section library; b_slope is NaN where a mix has none
+    names, mu_rho, density = mixture_table(mixtures)
+    b_slope = [spec.get("b_slope", np.nan) for spec in mixtures.values()]
+    return write_library(directory, names, ENERGY_GRID_MEV, mu_rho, density, b_slope)
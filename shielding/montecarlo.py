@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .materials import (MATERIAL_NAMES, B_SLOPE_STACK, DENSITY_STACK, Z_OVER_A_STACK,
+                        LOG_MU_RHO_TABLE, linear_attenuation)
+
+# --- MONTE CARLO SLAB TRANSPORT ---
+# Pencil beam at normal incidence on a homogeneous slab. Photons are tracked as whole NumPy batches:
+# every step samples a free path for all live photons, removes the ones that leave the slab, then splits
+# the rest into coherent scatters, Compton scatters (Klein-Nishina, free electrons) and absorptions. mu is the
+# total including coherent scattering; coherent events are strongly forward-peaked at these energies, so those
+# photons continue unchanged. Pair production and photoelectric events are both scored as absorption;
+# annihilation and fluorescence photons are not followed.
+# Below the 0.1 MeV end of the table mu is extrapolated in log-log space down to the energy cutoff.
+ELECTRON_REST_MEV = 0.51099895
+CLASSICAL_ELECTRON_RADIUS_CM = 2.8179403262e-13
+AVOGADRO = 6.02214076e23
+ENERGY_CUTOFF_MEV = 0.03
+# Tabulated mu is rounded to 4 figures, so coherent + Compton may exceed it by about that much
+PROBABILITY_TOLERANCE = 1e-3
+
+# Coherent mass attenuation at 0.1 MeV (cm^2/g, NIST XCOM, approximate), scaled as E^-2 above 0.1 MeV and
+# E^-1 below it; it is at most a few percent of mu on the 0.1 - 10 MeV grid
+COHERENT_MU_RHO_100KEV = np.array([{"Lead (Pb)": 0.095, "Tungsten (W)": 0.085, "Iron (Fe)": 0.025,
+                                    "Concrete": 0.0066, "Water": 0.0028}[n] for n in MATERIAL_NAMES])
+
+def coherent_attenuation(material, energy_mev):
+    # Coherent part of mu (cm^-1) for one material index
+    energy_mev = np.asarray(energy_mev, dtype=float)
+    power = np.where(energy_mev < 0.1, -1.0, -2.0)
+    return COHERENT_MU_RHO_100KEV[material] * DENSITY_STACK[material] * (energy_mev / 0.1) ** power
+
+def check_scattering_fraction(material, max_energy_mev, n_points=256):
+    # Coherent + Compton must not exceed the total mu anywhere a photon can be tracked, i.e. between the
+    # cutoff and the source energy; raises ValueError before any transport otherwise
+    energy = np.geomspace(ENERGY_CUTOFF_MEV, max(max_energy_mev, ENERGY_CUTOFF_MEV), n_points)
+    mu = linear_attenuation(energy, LOG_MU_RHO_TABLE[material], DENSITY_STACK[material])
+    electron_density = DENSITY_STACK[material] * AVOGADRO * Z_OVER_A_STACK[material]
+    scattering = coherent_attenuation(material, energy) + electron_density * klein_nishina_cross_section(energy)
+    if (scattering > mu * (1 + PROBABILITY_TOLERANCE)).any():
+        raise ValueError(f"Scattering exceeds total attenuation for {MATERIAL_NAMES[material]}; "
+                         f"check its mu_rho and z_over_a")
+
+def klein_nishina_cross_section(energy_mev):
+    # Total Klein-Nishina cross section per electron (cm^2)
+    k = np.asarray(energy_mev, dtype=float) / ELECTRON_REST_MEV
+    log_term = np.log1p(2 * k)
+    return 2 * np.pi * CLASSICAL_ELECTRON_RADIUS_CM ** 2 * (
+        (1 + k) / k ** 2 * (2 * (1 + k) / (1 + 2 * k) - log_term / k)
+        + log_term / (2 * k)
+        - (1 + 3 * k) / (1 + 2 * k) ** 2)
+
+def sample_compton(energy_mev, rng):
+    # Kahn's rejection method, vectorized: returns (scattered energy, cos theta) for every input photon
+    k = np.asarray(energy_mev, dtype=float) / ELECTRON_REST_MEV
+    ratio = np.empty_like(k)
+    pending = np.arange(k.size)
+    while pending.size:
+        kp = k[pending]
+        r1, r2, r3 = rng.random((3, pending.size))
+        low = r1 <= (1 + 2 * kp) / (9 + 2 * kp)
+        x = np.where(low, 1 + 2 * kp * r2, (1 + 2 * kp) / (1 + 2 * kp * r2))
+        cos_t = 1 - (x - 1) / kp
+        accept = np.where(low, r3 <= 4 * (1 / x - 1 / x ** 2), r3 <= 0.5 * (cos_t ** 2 + 1 / x))
+        ratio[pending[accept]] = x[accept]
+        pending = pending[~accept]
+    return energy_mev / ratio, 1 - (ratio - 1) / k
+
+def _transport_batch(material, energy_mev, thickness, n_photons, rng):
+    # Returns (transmitted count, sum of transmitted energy, sum of squared energy, uncollided count)
+    log_mu_rho, density = LOG_MU_RHO_TABLE[material], DENSITY_STACK[material]
+    electron_density = density * AVOGADRO * Z_OVER_A_STACK[material]
+
+    z = np.zeros(n_photons)
+    w = np.ones(n_photons)
+    energy = np.full(n_photons, float(energy_mev))
+    n_trans = n_uncollided = 0
+    first_flight = True
+    sum_e = sum_e2 = 0.0
+
+    while z.size:
+        mu = linear_attenuation(energy, log_mu_rho, density)
+        z = z + w * rng.exponential(1.0, z.size) / mu
+
+        out = z >= thickness
+        e_out = energy[out]
+        if first_flight:
+            # Every later flight follows an interaction, coherent scatters included
+            n_uncollided, first_flight = e_out.size, False
+        n_trans += e_out.size
+        sum_e += e_out.sum()
+        sum_e2 += (e_out ** 2).sum()
+
+        # Photons still inside interact; back-scattered ones (z < 0) are simply dropped
+        inside = (z > 0) & ~out
+        z, w, energy, mu = z[inside], w[inside], energy[inside], mu[inside]
+        p_coherent = coherent_attenuation(material, energy) / mu
+        p_compton = electron_density * klein_nishina_cross_section(energy) / mu
+        r = rng.random(z.size)
+        coherent = r < p_coherent
+        scatter = ~coherent & (r < p_coherent + p_compton)
+        keep = coherent | scatter
+        z, w, energy, scatter = z[keep], w[keep], energy[keep], scatter[keep]
+
+        energy[scatter], cos_t = sample_compton(energy[scatter], rng)
+        phi = 2 * np.pi * rng.random(cos_t.size)
+        sin_t = np.sqrt(np.maximum(1 - cos_t ** 2, 0.0))
+        w_s = w[scatter]
+        w[scatter] = np.clip(w_s * cos_t + np.sqrt(np.maximum(1 - w_s ** 2, 0.0)) * sin_t * np.cos(phi), -1.0, 1.0)
+
+        alive = energy >= ENERGY_CUTOFF_MEV
+        z, w, energy = z[alive], w[alive], energy[alive]
+
+    return n_trans, sum_e, sum_e2, n_uncollided
+
+def _run_chunk(args):
+    material, energy_mev, thickness, n_photons, batch_size, seed = args
+    rng = np.random.default_rng(seed)
+    totals = np.zeros(4)
+    for start in range(0, n_photons, batch_size):
+        totals += _transport_batch(material, energy_mev, thickness, min(batch_size, n_photons - start), rng)
+    return totals
+
+def simulate_buildup(name, energy_mev, thicknesses, n_photons=200_000, batch_size=100_000,
+                     processes=None, seed=None, mp_context=None):
+    # Simulated vs analytic build-up for one material over a set of slab thicknesses (cm).
+    # buildup_number counts every transmitted photon, buildup_energy weights them by energy (energy fluence);
+    # both are relative to the analytic uncollided transmission exp(-mu * t).
+    material = MATERIAL_NAMES.index(name)
+    check_scattering_fraction(material, energy_mev)
+    thicknesses = np.atleast_1d(np.asarray(thicknesses, dtype=float))
+    n_chunks = max(processes or 1, 1)
+    chunk = -(-n_photons // n_chunks)
+    seeds = np.random.SeedSequence(seed).spawn(len(thicknesses) * n_chunks)
+    tasks = [(material, energy_mev, t, min(chunk, n_photons - c * chunk), batch_size, seeds[i * n_chunks + c])
+             for i, t in enumerate(thicknesses) for c in range(n_chunks)]
+
+    if processes and processes > 1:
+        # mp_context: pass a forkserver/spawn context when calling from a multi-threaded host (e.g. a web server)
+        with ProcessPoolExecutor(max_workers=processes, mp_context=mp_context) as pool:
+            totals = np.array(list(pool.map(_run_chunk, tasks)))
+    else:
+        totals = np.array([_run_chunk(task) for task in tasks])
+    n_trans, sum_e, sum_e2, n_uncollided = totals.reshape(len(thicknesses), n_chunks, 4).sum(axis=1).T
+
+    mfp = linear_attenuation(energy_mev, LOG_MU_RHO_TABLE[material], DENSITY_STACK[material]) * thicknesses
+    uncollided = n_photons * np.exp(-mfp)
+    mean_e = sum_e / n_photons
+    err_e = np.sqrt(np.maximum(sum_e2 / n_photons - mean_e ** 2, 0.0) / n_photons)
+    return {
+        "thickness": thicknesses,
+        "mfp": mfp,
+        "transmission": n_trans / n_photons,
+        "uncollided_fraction": n_uncollided / n_photons,
+        "buildup_number": n_trans / uncollided,
+        "buildup_energy": sum_e / (energy_mev * uncollided),
+        "buildup_energy_err": err_e * n_photons / (energy_mev * uncollided),
+        "buildup_analytic": 1 + B_SLOPE_STACK[material] * mfp,
+    }
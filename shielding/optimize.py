@@ -0,0 +1,95 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .materials import MATERIAL_NAMES, DENSITY_STACK, COST_STACK
+from .layers import stack_coefficients, combine_buildup
+from .solver import required_thickness
+
+# --- SHIELD-STACK OPTIMIZER ---
+# Candidates are thickness *proportions* d on the simplex (sum d = 1). For a fixed order the stack build-up
+# slope does not change when every layer is scaled together, so each candidate is scaled exactly onto the
+# transmission target with the inverse solver; the objective is linear in thickness, so it scales too.
+# The search is then a constraint-free cross-entropy loop over proportions, one batched call per generation.
+OBJECTIVES = ("mass", "thickness", "cost")
+
+def _objective_weights(names, objective):
+    # Per-cm weight of each layer, per unit shield area: kg/m^2, cm, or USD/m^2
+    idx = [MATERIAL_NAMES.index(name) for name in names]
+    if objective == "mass":
+        return DENSITY_STACK[idx] * 10.0
+    if objective == "thickness":
+        return np.ones(len(idx))
+    if objective == "cost":
+        return DENSITY_STACK[idx] * 10.0 * COST_STACK[idx]
+    raise ValueError(f"Unknown objective {objective!r}; expected one of {OBJECTIVES}")
+
+def _scale_to_target(proportions, mu, b_slope, target, rule):
+    # proportions (n_candidates, n_layers) -> layer thicknesses (cm) that meet the target exactly
+    unit_mfp = proportions * mu
+    b_eff = combine_buildup(unit_mfp, b_slope, rule)
+    total_mfp = required_thickness(target, np.ones(len(b_eff)), b_eff)[:, 0]
+    return proportions * (total_mfp / unit_mfp.sum(axis=1))[:, np.newaxis]
+
+def _drop_thin_layers(proportions, thick, mu, min_layer_mfp):
+    # A sliver of a low-build-up material must not be able to swap the stack's build-up slope,
+    # so layers thinner than min_layer_mfp are removed (the layer with the most mfp always survives)
+    mfp = thick * mu
+    keep = (mfp >= min_layer_mfp) | (mfp == mfp.max(axis=1, keepdims=True))
+    proportions = np.where(keep, proportions, 0.0)
+    return proportions / proportions.sum(axis=1, keepdims=True)
+
+def _optimize_order(args):
+    names, target, energy_mev, objective, rule, min_layer_mfp, population, iterations, elite_frac, seed = args
+    rng = np.random.default_rng(seed)
+    mu, b_slope = stack_coefficients(names, energy_mev)
+    weights = _objective_weights(names, objective)
+    n_layers = len(names)
+    n_elite = max(2, int(population * elite_frac))
+
+    # First generation: uniform over the simplex plus every single-material vertex
+    proportions = np.vstack([np.eye(n_layers), rng.dirichlet(np.ones(n_layers), population - n_layers)])
+    best_value, best_thick = np.inf, None
+    for _ in range(iterations):
+        thick = _scale_to_target(proportions, mu, b_slope, target, rule)
+        # Dropping a layer can lower the stack build-up slope, so the rescale may thin the survivors below the
+        # minimum again; repeat until no candidate loses a layer (at most n_layers - 1 rounds). The layer with
+        # the most mfp is never dropped, so every candidate ends as one layer or layers all >= min_layer_mfp
+        while True:
+            dropped = _drop_thin_layers(proportions, thick, mu, min_layer_mfp)
+            if np.array_equal(dropped > 0, proportions > 0):
+                break
+            proportions = dropped
+            thick = _scale_to_target(proportions, mu, b_slope, target, rule)
+        values = thick @ weights
+        order = np.argsort(values)
+        if values[order[0]] < best_value:
+            best_value, best_thick = values[order[0]], thick[order[0]]
+
+        elite = proportions[order[:n_elite]]
+        mean, std = elite.mean(axis=0), elite.std(axis=0) + 1e-3
+        proportions = np.clip(mean + std * rng.standard_normal((population, n_layers)), 0.0, None)
+        proportions[proportions.sum(axis=1) == 0] = 1.0
+        proportions /= proportions.sum(axis=1, keepdims=True)
+
+    return {"layers": tuple(names), "thickness": best_thick, "objective": float(best_value)}
+
+def optimize_stack(materials, target, energy_mev, n_layers=2, objective="mass", rule="last",
+                   min_layer_mfp=0.5, population=256, iterations=30, elite_frac=0.1, processes=None,
+                   seed=None):
+    # Searches every ordered choice of n_layers distinct materials; returns one result per order, best first.
+    # processes > 1 fans the orders out across a process pool.
+    _objective_weights(materials, objective)
+    orders = list(itertools.permutations(materials, n_layers))
+    seeds = np.random.SeedSequence(seed).spawn(len(orders))
+    tasks = [(order, target, energy_mev, objective, rule, min_layer_mfp, population, iterations,
+              elite_frac, s)
+             for order, s in zip(orders, seeds)]
+
+    if processes and processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_optimize_order, tasks))
+    else:
+        results = [_optimize_order(task) for task in tasks]
+    return sorted(results, key=lambda r: r["objective"])
@@ -0,0 +1,73 @@
+import numpy as np
+
+# --- ADAPTIVE THICKNESS SAMPLING ---
+# Curves are refined where a straight line between neighbouring samples misrepresents log(I/I0), i.e. where the
+# log-curvature is high. Every interval caches the error at its midpoint; each round splits the worst intervals
+# (within the point budget) and evaluates only the new midpoints, for all curves in one batched call.
+# Values below `floor` are clipped so detail far under the plotted range does not consume points.
+
+def _log_transmission(values, floor):
+    return np.log(np.maximum(values, floor))
+
+def adaptive_thickness_grid(evaluate, max_thick, max_points=200, tol=0.02, initial=9, floor=1e-6):
+    # evaluate(x (n,)) -> transmission (n_curves, n); returns (x (m,), transmission (n_curves, m)), m <= max_points
+    x = np.linspace(0, max_thick, initial)
+    y = np.atleast_2d(evaluate(x))
+    mid_x = 0.5 * (x[:-1] + x[1:])
+    mid_y = np.atleast_2d(evaluate(mid_x))
+
+    while len(x) < max_points:
+        log_y, log_mid = _log_transmission(y, floor), _log_transmission(mid_y, floor)
+        err = np.abs(log_mid - 0.5 * (log_y[:, :-1] + log_y[:, 1:])).max(axis=0)
+        worst = np.argsort(err)[::-1][:max_points - len(x)]
+        split = np.sort(worst[err[worst] > tol])
+        if not split.size:
+            break
+
+        # Midpoints of split intervals become samples; each split interval becomes two new intervals
+        new_x = mid_x[split]
+        child_mid = np.concatenate([0.5 * (x[split] + new_x), 0.5 * (new_x + x[split + 1])])
+        child_y = np.atleast_2d(evaluate(child_mid))
+        left, right = child_y[:, :split.size], child_y[:, split.size:]
+
+        x = np.insert(x, split + 1, new_x)
+        y = np.insert(y, split + 1, mid_y[:, split], axis=1)
+        # Interval i of the old grid is replaced by (left, right) children in place
+        keep = np.ones(len(mid_x), dtype=bool)
+        keep[split] = False
+        order = np.argsort(np.concatenate([np.flatnonzero(keep), split, split + 0.5]), kind="stable")
+        mid_x = np.concatenate([mid_x[keep], child_mid[:split.size], child_mid[split.size:]])[order]
+        mid_y = np.concatenate([mid_y[:, keep], left, right], axis=1)[:, order]
+
+    return x, y
+
+# --- PLOT DOWNSAMPLING ---
+# Min-max decimation: x is cut into buckets of equal width (equal pixel columns, however unevenly the adaptive
+# grid is spaced) and each curve keeps the first and last sample plus its minimum and maximum in every non-empty
+# bucket, so spikes and the envelope survive while the point count is bounded by the pixels available. Bucket
+# extrema are found for all curves at once by sorting each curve's interior samples on (bucket, y). log is
+# monotone, so the same samples are kept whether the y axis is linear or log.
+
+def minmax_downsample(x, y, n_buckets):
+    # x (n,) ascending, y (n_curves, n) -> (x (n_curves, m), y (n_curves, m)) with m <= 2 * n_buckets + 2, or
+    # the input unchanged (with x broadcast per curve) when it is already small enough
+    x, y = np.asarray(x), np.atleast_2d(y)
+    n = x.size
+    if n <= 2 * n_buckets + 2:
+        return np.broadcast_to(x, y.shape), y
+
+    # Bucket of every interior sample 1..n-2; buckets holding no sample are skipped
+    edges = np.linspace(x[0], x[-1], n_buckets + 1)[1:-1]
+    bucket = np.searchsorted(edges, x[1:-1], side="right")
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(starts[1:], bucket.size) - 1
+    # Sorted by bucket, then by y: each bucket's run starts at its minimum and ends at its maximum
+    interior = y[:, 1:-1]
+    order = np.lexsort((interior, np.broadcast_to(bucket, interior.shape)), axis=-1)
+    lo, hi = order[:, starts] + 1, order[:, ends] + 1
+
+    n_curves = y.shape[0]
+    idx = np.concatenate([np.zeros((n_curves, 1), dtype=int), np.minimum(lo, hi), np.maximum(lo, hi),
+                          np.full((n_curves, 1), n - 1)], axis=1)
+    idx.sort(axis=1)
+    return x[idx], np.take_along_axis(y, idx, axis=1)
@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .materials import (ENERGY_GRID_MEV, MATERIALS, MATERIAL_NAMES, B_SLOPE_STACK, DENSITY_STACK, COST_STACK,
+                        Z_OVER_A_STACK, LOG_MU_RHO_TABLE, linear_attenuation)
+
+# --- CROSS-SECTION LIBRARY ---
+# Column-oriented material library on disk: manifest.json holds the material names (in row order), the energy
+# grid and one entry per column, each a raw little-endian float64 file opened with np.memmap. log(mu/rho) is a
+# (n_materials, n_energies) C-order column, so one material's cross sections are one contiguous row and a
+# lookup only pages in the rows it selects. Opening a library reads the manifest and maps the files, which
+# costs the same for five materials or five thousand. Per-material scalars (density, b_slope, ...) are
+# (n_materials,) columns; a column missing from a library reads as NaN.
+XSDB_VERSION = 1
+XSDB_DTYPE = "<f8"
+SCALAR_COLUMNS = ("density", "b_slope", "z_over_a", "cost_per_kg")
+
+def write_library(directory, names, energy_grid, mu_rho, density, b_slope, z_over_a=None, cost_per_kg=None,
+                  colors=None):
+    # mu_rho (n_materials, n_energies) cm^2/g; scalars (n_materials,). Returns the manifest path.
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    n_materials = len(names)
+    columns = {"log_mu_rho": np.log(np.asarray(mu_rho, dtype=float)).reshape(n_materials, len(energy_grid))}
+    for name, values in zip(SCALAR_COLUMNS, (density, b_slope, z_over_a, cost_per_kg)):
+        if values is not None:
+            columns[name] = np.asarray(values, dtype=float).reshape(n_materials)
+
+    manifest = {"version": XSDB_VERSION, "materials": list(names), "energy_grid_mev": list(map(float, energy_grid)),
+                "columns": {}, "colors": list(colors) if colors is not None else None}
+    for name, values in columns.items():
+        np.ascontiguousarray(values, dtype=XSDB_DTYPE).tofile(directory / f"{name}.bin")
+        manifest["columns"][name] = {"file": f"{name}.bin", "dtype": XSDB_DTYPE, "shape": list(values.shape)}
+    path = directory / "manifest.json"
+    path.write_text(json.dumps(manifest, indent=1))
+    return path
+
+def export_builtin_library(directory):
+    # The hard-coded MATERIALS as a library, a starting point for larger ones
+    return write_library(directory, MATERIAL_NAMES, ENERGY_GRID_MEV, np.exp(LOG_MU_RHO_TABLE), DENSITY_STACK,
+                         B_SLOPE_STACK, Z_OVER_A_STACK, COST_STACK, [MATERIALS[n]['color'] for n in MATERIAL_NAMES])
+
+def open_library(directory):
+    directory = Path(directory)
+    manifest = json.loads((directory / "manifest.json").read_text())
+    if manifest["version"] != XSDB_VERSION:
+        raise ValueError(f"Unsupported cross-section library version {manifest['version']} in {directory}")
+    names = manifest["materials"]
+    library = {"directory": directory, "names": names, "index": {name: i for i, name in enumerate(names)},
+               "colors": manifest.get("colors"), "log_energy": np.log(manifest["energy_grid_mev"])}
+    for name, column in manifest["columns"].items():
+        library[name] = np.memmap(directory / column["file"], dtype=column["dtype"], mode="r",
+                                  shape=tuple(column["shape"]))
+    return library
+
+def _column(library, name, idx):
+    if name in library:
+        return np.asarray(library[name][idx])
+    return np.full(len(idx), np.nan)
+
+def library_rows(library, names):
+    # Row indices for material names, with the names that are missing reported together
+    missing = [name for name in names if name not in library["index"]]
+    if missing:
+        raise KeyError(f"Not in {library['directory']}: {', '.join(missing)}")
+    return np.array([library["index"][name] for name in names], dtype=np.intp)
+
+def library_attenuation(library, names, energy_mev):
+    # mu (cm^-1) for the named materials: (n_names,) or (n_names, *energy.shape)
+    idx = library_rows(library, names)
+    return linear_attenuation(energy_mev, np.asarray(library["log_mu_rho"][idx]), _column(library, "density", idx),
+                              library["log_energy"])
+
+def library_coefficients(library, names, energy_mev):
+    # Same contract as layers.stack_coefficients, for library materials: (mu, b_slope)
+    return library_attenuation(library, names, energy_mev), _column(library, "b_slope", library_rows(library, names))
+
+def library_from_env():
+    # Library named by SHIELDING_XSDB, or None when it is unset
+    directory = os.environ.get("SHIELDING_XSDB")
+    return open_library(directory) if directory else None
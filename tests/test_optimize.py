@@ -0,0 +1,23 @@
+# Optimizer regression checks. Usage: python -m pytest tests
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shielding import optimize_stack, stack_coefficients
+
+def check_min_layer_mfp(results, energy_mev, min_layer_mfp=0.5):
+    for result in results:
+        mu, _ = stack_coefficients(result["layers"], energy_mev)
+        mfp = (result["thickness"] * mu)[result["thickness"] > 0]
+        assert len(mfp) == 1 or mfp.min() >= min_layer_mfp * (1 - 1e-9), (result["layers"], mfp)
+
+def test_thick_low_mu_layer_is_dropped():
+    # A thick water or concrete layer can be fewer mfp than a thinner dense one; it must not be kept below
+    # min_layer_mfp because it is the thickest in cm
+    for materials in (["Water", "Lead (Pb)"], ["Concrete", "Tungsten (W)"]):
+        results = optimize_stack(materials, 0.9, 2.0, n_layers=2, objective="mass", rule="last", seed=0)
+        check_min_layer_mfp(results, 2.0)
+        assert all(np.isfinite(r["objective"]) for r in results)